@@ -1,16 +1,60 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import Optional
-import pandas as pd
-import numpy as np
-from io import StringIO
-import json
+from typing import BinaryIO, List, Tuple
+from collections import deque
+import asyncio
+import csv
+import io
 
+from app.core.demo_cache import DemoCache
 from app.schemas.business_health import BusinessMetrics, BusinessHealthResponse, RiskPrediction
 from app.services.business_health_service import BusinessHealthService
 
 router = APIRouter()
 service = BusinessHealthService()
 
+REQUIRED_CSV_COLUMNS = ("revenue", "expenses")
+# Only the most recent months are analyzed; older rows beyond this are discarded.
+MAX_CSV_ROWS = 120
+
+def _read_csv_metrics(fileobj: BinaryIO) -> Tuple[List[float], List[float]]:
+    """Stream the last MAX_CSV_ROWS revenue/expenses rows out of an uploaded CSV file."""
+    revenue = deque(maxlen=MAX_CSV_ROWS)
+    expenses = deque(maxlen=MAX_CSV_ROWS)
+    
+    # utf-8-sig drops the byte-order mark that Excel writes in front of the header.
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text)
+        header = next(reader, [])
+        if any(column not in header for column in REQUIRED_CSV_COLUMNS):
+            raise HTTPException(
+                status_code=400,
+                detail="CSV must contain 'revenue' and 'expenses' columns"
+            )
+        revenue_idx = header.index("revenue")
+        expenses_idx = header.index("expenses")
+        
+        for row in reader:
+            if not row:
+                continue
+            try:
+                revenue.append(float(row[revenue_idx]))
+                expenses.append(float(row[expenses_idx]))
+            except (ValueError, IndexError):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"CSV row {reader.line_num} has a missing or non-numeric revenue/expenses value"
+                )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    finally:
+        text.detach()
+    
+    if not revenue:
+        raise HTTPException(status_code=400, detail="CSV contains no data rows")
+    
+    return list(revenue), list(expenses)
+
 @router.post("/analyze", response_model=BusinessHealthResponse)
 async def analyze_business_health(metrics: BusinessMetrics):
     """
@@ -23,7 +67,7 @@ async def analyze_business_health(metrics: BusinessMetrics):
     - Overall business health score
     """
     try:
-        prediction = service.predict_business_health(metrics)
+        prediction = await service.predict_business_health(metrics)
         return BusinessHealthResponse(
             success=True,
             data=prediction,
@@ -40,47 +84,49 @@ async def analyze_from_csv(file: UploadFile = File(...)):
     CSV should contain columns: date, revenue, expenses
     """
     try:
-        contents = await file.read()
-        df = pd.read_csv(StringIO(contents.decode('utf-8')))
-        
-        if 'revenue' not in df.columns or 'expenses' not in df.columns:
-            raise HTTPException(
-                status_code=400,
-                detail="CSV must contain 'revenue' and 'expenses' columns"
-            )
+        await file.seek(0)
+        revenue, expenses = await asyncio.to_thread(_read_csv_metrics, file.file)
         
-        metrics = BusinessMetrics(
-            monthly_revenue=df['revenue'].tolist(),
-            monthly_expenses=df['expenses'].tolist()
+        # Columns were already parsed as floats; skip re-validating them element by element.
+        metrics = BusinessMetrics.model_construct(
+            monthly_revenue=revenue,
+            monthly_expenses=expenses
         )
         
-        prediction = service.predict_business_health(metrics)
+        prediction = await service.predict_business_health(metrics)
         return BusinessHealthResponse(
             success=True,
             data=prediction,
             message="Business health analysis from CSV completed"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CSV analysis failed: {str(e)}")
 
+_DEMO_METRICS = BusinessMetrics(
+    monthly_revenue=[50000, 52000, 48000, 45000, 43000, 40000],
+    monthly_expenses=[45000, 46000, 47000, 48000, 49000, 50000],
+    customer_count=150,
+    customer_churn_rate=0.05,
+    industry="SaaS",
+    business_age_months=18,
+    employee_count=8
+)
+
+async def _build_demo_response() -> Tuple[BusinessHealthResponse, bool]:
+    # Scoring is deterministic, so the first result is always final.
+    return BusinessHealthResponse(
+        success=True,
+        data=await service.predict_business_health(_DEMO_METRICS),
+        message="Demo business health analysis"
+    ), True
+
+_demo = DemoCache(_build_demo_response)
+
 @router.get("/demo")
 async def get_demo_analysis():
     """
     Get a demo business health analysis with sample data.
     """
-    demo_metrics = BusinessMetrics(
-        monthly_revenue=[50000, 52000, 48000, 45000, 43000, 40000],
-        monthly_expenses=[45000, 46000, 47000, 48000, 49000, 50000],
-        customer_count=150,
-        customer_churn_rate=0.05,
-        industry="SaaS",
-        business_age_months=18,
-        employee_count=8
-    )
-    
-    prediction = service.predict_business_health(demo_metrics)
-    return BusinessHealthResponse(
-        success=True,
-        data=prediction,
-        message="Demo business health analysis"
-    )
+    return await _demo.get()
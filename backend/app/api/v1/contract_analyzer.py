@@ -1,13 +1,111 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
-import PyPDF2
-from io import BytesIO
+from typing import BinaryIO, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import pypdfium2 as pdfium
+import asyncio
+import os
+import threading
 
-from app.schemas.contract import ContractAnalysisRequest, ContractAnalysisResponse
+from app.core.config import settings
+from app.core.demo_cache import DemoCache
+from app.schemas.contract import ContractAnalysisRequest, ContractAnalysisResponse, ContractAnalysisResult
 from app.services.contract_analyzer_service import ContractAnalyzerService
 
 router = APIRouter()
 service = ContractAnalyzerService()
 
+# PDFs with more pages than this are split across worker processes.
+PARALLEL_PDF_PAGE_THRESHOLD = 50
+# Every uvicorn worker gets its own pool, so each only takes its share of the
+# cores: cpu_count // WEB_CONCURRENCY unless PDF_POOL_WORKERS is set. With one
+# worker per core the share is 1 and large PDFs stay on the thread path.
+_pdf_workers = settings.PDF_POOL_WORKERS or max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        # spawn, not fork: a forked child would inherit _pdfium_lock in whatever
+        # state a to_thread caller left it, possibly locked forever.
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=_pdf_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+def shutdown_pdf_pool() -> None:
+    """Stop the PDF worker processes; called from the app lifespan."""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+# pdfium is not thread-safe; every threaded call into it from this process goes
+# through this lock. Pool workers are single-threaded and do not take it.
+_pdfium_lock = threading.Lock()
+
+def _page_text(pdf: pdfium.PdfDocument, index: int) -> str:
+    """Extract the text of one page, closing its handles before the document."""
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
+def _extract_pages(source: Union[bytes, BinaryIO], start: int, end: int) -> str:
+    """Extract the text of pages [start, end) from a PDF document; runs in a pool worker."""
+    pdf = pdfium.PdfDocument(source)
+    try:
+        return "\n".join(_page_text(pdf, i) for i in range(start, end))
+    finally:
+        pdf.close()
+
+def _extract_small_pdf(fileobj: BinaryIO) -> Tuple[int, Optional[str]]:
+    """
+    Return the page count and, unless the document is large enough to be
+    worth splitting across processes, its full text.
+    """
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(fileobj)
+        try:
+            page_count = len(pdf)
+            if page_count > PARALLEL_PDF_PAGE_THRESHOLD and _pdf_workers > 1:
+                return page_count, None
+            return page_count, "\n".join(_page_text(pdf, i) for i in range(page_count))
+        finally:
+            pdf.close()
+
+async def _extract_pdf_text(fileobj: BinaryIO) -> str:
+    """
+    Extract the text of every page of an uploaded PDF.
+    
+    Small documents are read straight from the spooled upload; large ones
+    are loaded once and fanned out to the process pool.
+    """
+    page_count, text = await asyncio.to_thread(_extract_small_pdf, fileobj)
+    if text is not None:
+        return text
+    
+    fileobj.seek(0)
+    contents = await asyncio.to_thread(fileobj.read)
+    loop = asyncio.get_running_loop()
+    pool = _get_pdf_pool()
+    chunk_size = -(-page_count // _pdf_workers)
+    parts = await asyncio.gather(*[
+        loop.run_in_executor(pool, _extract_pages, contents, start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ])
+    return "\n".join(parts)
+
+async def _analyze(contract_text: str, contract_type: Optional[str]) -> ContractAnalysisResult:
+    """Analyze a contract, normalising surrounding whitespace so identical text shares cache entries."""
+    return await service.analyze_contract(contract_text.strip(), contract_type)
+
 @router.post("/analyze", response_model=ContractAnalysisResponse)
 async def analyze_contract(request: ContractAnalysisRequest):
     """
@@ -20,7 +118,7 @@ async def analyze_contract(request: ContractAnalysisRequest):
     - Overall risk assessment
     """
     try:
-        result = await service.analyze_contract(
+        result = await _analyze(
             request.contract_text,
             request.contract_type
         )
@@ -44,17 +142,13 @@ async def analyze_contract_pdf(
         if not file.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        contents = await file.read()
-        pdf_reader = PyPDF2.PdfReader(BytesIO(contents))
-        
-        contract_text = ""
-        for page in pdf_reader.pages:
-            contract_text += page.extract_text()
+        await file.seek(0)
+        contract_text = await _extract_pdf_text(file.file)
         
         if not contract_text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from PDF")
         
-        result = await service.analyze_contract(contract_text, contract_type)
+        result = await _analyze(contract_text, contract_type)
         return ContractAnalysisResponse(
             success=True,
             data=result,
@@ -63,12 +157,7 @@ async def analyze_contract_pdf(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF analysis failed: {str(e)}")
 
-@router.get("/demo")
-async def get_demo_analysis():
-    """
-    Get a demo contract analysis with sample contract.
-    """
-    demo_contract = """
+DEMO_CONTRACT = """
     SERVICE AGREEMENT
     
     This Agreement is entered into between Company A (Client) and Company B (Service Provider).
@@ -87,10 +176,20 @@ async def get_demo_analysis():
     
     7. CONFIDENTIALITY: Provider shall maintain strict confidentiality of all Client information indefinitely.
     """
-    
-    result = await service.analyze_contract(demo_contract, "service_agreement")
+
+async def _build_demo_response() -> Tuple[ContractAnalysisResponse, bool]:
+    result, final = await service.analyze_contract_with_status(DEMO_CONTRACT, "service_agreement")
     return ContractAnalysisResponse(
         success=True,
         data=result,
         message="Demo contract analysis"
-    )
+    ), final
+
+_demo = DemoCache(_build_demo_response)
+
+@router.get("/demo")
+async def get_demo_analysis():
+    """
+    Get a demo contract analysis with sample contract.
+    """
+    return await _demo.get()
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Tuple
 from datetime import datetime
-import openai
+import logging
+import orjson
 
+from app.core.cache import cache_get, cache_key, cache_set
 from app.core.config import settings
+from app.core.demo_cache import DemoCache
+from app.core.openai_client import get_openai_client
+from app.core.utils import utcnow
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 class CrisisRequest(BaseModel):
     crisis_type: str = Field(..., description="Type: cash_flow, data_breach, legal, customer_loss, reputation, market_shift")
@@ -15,6 +21,8 @@ class CrisisRequest(BaseModel):
     context: Optional[dict] = Field(None, description="Additional context")
 
 class CrisisStep(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     step_number: int
     title: str
     description: str
@@ -43,11 +51,7 @@ async def generate_crisis_playbook(request: CrisisRequest):
     Generate AI-powered crisis response playbook with step-by-step guidance.
     """
     try:
-        if settings.OPENAI_API_KEY:
-            playbook = await generate_ai_playbook(request)
-        else:
-            playbook = generate_template_playbook(request)
-        
+        playbook, _ = await _generate_playbook(request)
         return CrisisResponse(
             success=True,
             data=playbook,
@@ -56,8 +60,41 @@ async def generate_crisis_playbook(request: CrisisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Playbook generation failed: {str(e)}")
 
+async def _generate_playbook(request: CrisisRequest) -> Tuple[CrisisPlaybook, bool]:
+    """
+    Generate a playbook and report whether it is final: an AI playbook, or
+    the template when no API key is configured. A template served after an
+    AI failure is not final.
+    """
+    if not settings.OPENAI_API_KEY:
+        return generate_template_playbook(request), True
+    
+    playbook = await generate_cached_ai_playbook(request)
+    if playbook is None:
+        return generate_template_playbook(request), False
+    return playbook, True
+
+async def generate_cached_ai_playbook(request: CrisisRequest) -> Optional[CrisisPlaybook]:
+    """
+    Generate an AI playbook, sharing results for identical crises across
+    workers. Returns None when generation fails; failures are not cached.
+    """
+    key = cache_key("crisis", request.crisis_type, request.severity or "", request.description)
+    cached = await cache_get(key)
+    if cached is not None:
+        return CrisisPlaybook.model_validate_json(cached)
+    
+    try:
+        playbook = await generate_ai_playbook(request)
+    except Exception as e:
+        logger.warning("AI playbook generation failed: %s", e)
+        return None
+    
+    await cache_set(key, playbook.model_dump_json().encode())
+    return playbook
+
 async def generate_ai_playbook(request: CrisisRequest) -> CrisisPlaybook:
-    """Generate crisis playbook using GPT-4."""
+    """Generate crisis playbook using OpenAI in JSON mode; raises on API or parse errors."""
     
     prompt = f"""You are a business crisis management expert. Generate a detailed crisis response playbook for the following situation:
 
@@ -92,205 +129,196 @@ JSON format:
     "estimated_resolution_time": "timeframe"
 }}"""
 
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert business crisis management consultant."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
-        )
-        
-        import json
-        import re
-        result_text = response.choices[0].message.content
-        json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-        if json_match:
-            result_json = json.loads(json_match.group())
-        else:
-            result_json = json.loads(result_text)
-        
-        steps = [CrisisStep(**step) for step in result_json.get("steps", [])]
-        
-        return CrisisPlaybook(
-            crisis_type=request.crisis_type,
-            severity=request.severity,
-            immediate_actions=result_json.get("immediate_actions", []),
-            steps=steps,
-            resources=result_json.get("resources", []),
-            contacts=result_json.get("contacts", []),
-            estimated_resolution_time=result_json.get("estimated_resolution_time", "Unknown"),
-            generated_at=datetime.utcnow()
-        )
-    except Exception as e:
-        print(f"AI playbook generation failed: {e}")
-        return generate_template_playbook(request)
+    response = await get_openai_client().chat.completions.create(
+        model="gpt-4o-mini",
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": "You are an expert business crisis management consultant."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=1500
+    )
+    
+    result_json = orjson.loads(response.choices[0].message.content)
+    
+    steps = [CrisisStep(**step) for step in result_json.get("steps", [])]
+    
+    return CrisisPlaybook(
+        crisis_type=request.crisis_type,
+        severity=request.severity,
+        immediate_actions=result_json.get("immediate_actions", []),
+        steps=steps,
+        resources=result_json.get("resources", []),
+        contacts=result_json.get("contacts", []),
+        estimated_resolution_time=result_json.get("estimated_resolution_time", "Unknown"),
+        generated_at=utcnow()
+    )
+
+# Static playbook templates, built once; unknown crisis types fall back to cash_flow.
+_TEMPLATES = {
+    "cash_flow": {
+        "immediate_actions": (
+            "Review all outstanding invoices and accelerate collection",
+            "Identify non-essential expenses that can be cut immediately",
+            "Contact key suppliers to negotiate payment terms"
+        ),
+        "steps": (
+            CrisisStep(
+                step_number=1,
+                title="Emergency Cash Flow Assessment",
+                description="Calculate exact cash position and runway. List all receivables and payables.",
+                priority="critical",
+                timeframe="immediate",
+                resources_needed=["Financial statements", "Bank statements", "AR/AP reports"]
+            ),
+            CrisisStep(
+                step_number=2,
+                title="Expense Reduction Plan",
+                description="Cut all non-essential expenses. Renegotiate contracts. Delay discretionary spending.",
+                priority="critical",
+                timeframe="24h",
+                resources_needed=["Expense report", "Vendor contracts"]
+            ),
+            CrisisStep(
+                step_number=3,
+                title="Revenue Acceleration",
+                description="Contact all customers with outstanding invoices. Offer early payment discounts.",
+                priority="high",
+                timeframe="24-48h",
+                resources_needed=["Customer list", "Invoice system"]
+            ),
+            CrisisStep(
+                step_number=4,
+                title="Emergency Funding Options",
+                description="Explore bridge loans, invoice factoring, or emergency investor funding.",
+                priority="high",
+                timeframe="1 week",
+                resources_needed=["Financial projections", "Business plan"]
+            ),
+            CrisisStep(
+                step_number=5,
+                title="Stakeholder Communication",
+                description="Inform key stakeholders (team, investors, board) of situation and action plan.",
+                priority="medium",
+                timeframe="48h",
+                resources_needed=["Communication plan", "Financial summary"]
+            )
+        ),
+        "resources": ("Accountant", "Financial advisor", "Legal counsel", "Bank relationship manager"),
+        "contacts": ("Accountant", "Bank", "Key investors", "Business attorney"),
+        "estimated_resolution_time": "2-4 weeks"
+    },
+    "data_breach": {
+        "immediate_actions": (
+            "Isolate affected systems immediately",
+            "Change all passwords and revoke compromised credentials",
+            "Notify IT security team or consultant"
+        ),
+        "steps": (
+            CrisisStep(
+                step_number=1,
+                title="Contain the Breach",
+                description="Disconnect affected systems. Preserve evidence. Stop data exfiltration.",
+                priority="critical",
+                timeframe="immediate",
+                resources_needed=["IT team", "Security tools", "Backup systems"]
+            ),
+            CrisisStep(
+                step_number=2,
+                title="Assess Impact",
+                description="Determine what data was accessed, how many users affected, and extent of compromise.",
+                priority="critical",
+                timeframe="24h",
+                resources_needed=["Security logs", "Forensic tools", "IT expertise"]
+            ),
+            CrisisStep(
+                step_number=3,
+                title="Legal Compliance",
+                description="Notify authorities as required by GDPR/CCPA. Document everything.",
+                priority="high",
+                timeframe="72h",
+                resources_needed=["Legal counsel", "Compliance officer"]
+            ),
+            CrisisStep(
+                step_number=4,
+                title="Customer Notification",
+                description="Inform affected customers. Provide credit monitoring if needed.",
+                priority="high",
+                timeframe="72h",
+                resources_needed=["Communication plan", "PR support"]
+            ),
+            CrisisStep(
+                step_number=5,
+                title="Security Remediation",
+                description="Fix vulnerabilities. Implement additional security measures. Conduct security audit.",
+                priority="high",
+                timeframe="1-2 weeks",
+                resources_needed=["Security consultant", "IT infrastructure"]
+            )
+        ),
+        "resources": ("Cybersecurity consultant", "Legal counsel", "PR firm", "Forensics team"),
+        "contacts": ("IT security team", "Legal counsel", "Law enforcement", "Data protection authority"),
+        "estimated_resolution_time": "2-6 weeks"
+    },
+    "customer_loss": {
+        "immediate_actions": (
+            "Contact churned customers to understand reasons",
+            "Analyze churn patterns and identify at-risk customers",
+            "Implement immediate retention offers for at-risk customers"
+        ),
+        "steps": (
+            CrisisStep(
+                step_number=1,
+                title="Churn Analysis",
+                description="Analyze why customers are leaving. Identify common patterns and root causes.",
+                priority="high",
+                timeframe="24-48h",
+                resources_needed=["Customer data", "Analytics tools", "Feedback surveys"]
+            ),
+            CrisisStep(
+                step_number=2,
+                title="At-Risk Customer Identification",
+                description="Identify customers showing churn signals. Prioritize high-value accounts.",
+                priority="high",
+                timeframe="48h",
+                resources_needed=["CRM data", "Usage analytics"]
+            ),
+            CrisisStep(
+                step_number=3,
+                title="Retention Campaign",
+                description="Launch targeted retention campaign with special offers and personalized outreach.",
+                priority="high",
+                timeframe="1 week",
+                resources_needed=["Marketing team", "Special offers", "Communication tools"]
+            ),
+            CrisisStep(
+                step_number=4,
+                title="Product/Service Improvement",
+                description="Address root causes identified in churn analysis. Fix product issues.",
+                priority="medium",
+                timeframe="2-4 weeks",
+                resources_needed=["Product team", "Development resources"]
+            ),
+            CrisisStep(
+                step_number=5,
+                title="Customer Success Program",
+                description="Implement proactive customer success program to prevent future churn.",
+                priority="medium",
+                timeframe="ongoing",
+                resources_needed=["Customer success team", "Monitoring tools"]
+            )
+        ),
+        "resources": ("Customer success team", "Marketing team", "Product team", "Analytics tools"),
+        "contacts": ("Customer success manager", "Product manager", "Marketing lead"),
+        "estimated_resolution_time": "4-8 weeks"
+    }
+}
 
 def generate_template_playbook(request: CrisisRequest) -> CrisisPlaybook:
     """Generate template-based crisis playbook."""
     
-    playbooks = {
-        "cash_flow": {
-            "immediate_actions": [
-                "Review all outstanding invoices and accelerate collection",
-                "Identify non-essential expenses that can be cut immediately",
-                "Contact key suppliers to negotiate payment terms"
-            ],
-            "steps": [
-                CrisisStep(
-                    step_number=1,
-                    title="Emergency Cash Flow Assessment",
-                    description="Calculate exact cash position and runway. List all receivables and payables.",
-                    priority="critical",
-                    timeframe="immediate",
-                    resources_needed=["Financial statements", "Bank statements", "AR/AP reports"]
-                ),
-                CrisisStep(
-                    step_number=2,
-                    title="Expense Reduction Plan",
-                    description="Cut all non-essential expenses. Renegotiate contracts. Delay discretionary spending.",
-                    priority="critical",
-                    timeframe="24h",
-                    resources_needed=["Expense report", "Vendor contracts"]
-                ),
-                CrisisStep(
-                    step_number=3,
-                    title="Revenue Acceleration",
-                    description="Contact all customers with outstanding invoices. Offer early payment discounts.",
-                    priority="high",
-                    timeframe="24-48h",
-                    resources_needed=["Customer list", "Invoice system"]
-                ),
-                CrisisStep(
-                    step_number=4,
-                    title="Emergency Funding Options",
-                    description="Explore bridge loans, invoice factoring, or emergency investor funding.",
-                    priority="high",
-                    timeframe="1 week",
-                    resources_needed=["Financial projections", "Business plan"]
-                ),
-                CrisisStep(
-                    step_number=5,
-                    title="Stakeholder Communication",
-                    description="Inform key stakeholders (team, investors, board) of situation and action plan.",
-                    priority="medium",
-                    timeframe="48h",
-                    resources_needed=["Communication plan", "Financial summary"]
-                )
-            ],
-            "resources": ["Accountant", "Financial advisor", "Legal counsel", "Bank relationship manager"],
-            "contacts": ["Accountant", "Bank", "Key investors", "Business attorney"],
-            "estimated_resolution_time": "2-4 weeks"
-        },
-        "data_breach": {
-            "immediate_actions": [
-                "Isolate affected systems immediately",
-                "Change all passwords and revoke compromised credentials",
-                "Notify IT security team or consultant"
-            ],
-            "steps": [
-                CrisisStep(
-                    step_number=1,
-                    title="Contain the Breach",
-                    description="Disconnect affected systems. Preserve evidence. Stop data exfiltration.",
-                    priority="critical",
-                    timeframe="immediate",
-                    resources_needed=["IT team", "Security tools", "Backup systems"]
-                ),
-                CrisisStep(
-                    step_number=2,
-                    title="Assess Impact",
-                    description="Determine what data was accessed, how many users affected, and extent of compromise.",
-                    priority="critical",
-                    timeframe="24h",
-                    resources_needed=["Security logs", "Forensic tools", "IT expertise"]
-                ),
-                CrisisStep(
-                    step_number=3,
-                    title="Legal Compliance",
-                    description="Notify authorities as required by GDPR/CCPA. Document everything.",
-                    priority="high",
-                    timeframe="72h",
-                    resources_needed=["Legal counsel", "Compliance officer"]
-                ),
-                CrisisStep(
-                    step_number=4,
-                    title="Customer Notification",
-                    description="Inform affected customers. Provide credit monitoring if needed.",
-                    priority="high",
-                    timeframe="72h",
-                    resources_needed=["Communication plan", "PR support"]
-                ),
-                CrisisStep(
-                    step_number=5,
-                    title="Security Remediation",
-                    description="Fix vulnerabilities. Implement additional security measures. Conduct security audit.",
-                    priority="high",
-                    timeframe="1-2 weeks",
-                    resources_needed=["Security consultant", "IT infrastructure"]
-                )
-            ],
-            "resources": ["Cybersecurity consultant", "Legal counsel", "PR firm", "Forensics team"],
-            "contacts": ["IT security team", "Legal counsel", "Law enforcement", "Data protection authority"],
-            "estimated_resolution_time": "2-6 weeks"
-        },
-        "customer_loss": {
-            "immediate_actions": [
-                "Contact churned customers to understand reasons",
-                "Analyze churn patterns and identify at-risk customers",
-                "Implement immediate retention offers for at-risk customers"
-            ],
-            "steps": [
-                CrisisStep(
-                    step_number=1,
-                    title="Churn Analysis",
-                    description="Analyze why customers are leaving. Identify common patterns and root causes.",
-                    priority="high",
-                    timeframe="24-48h",
-                    resources_needed=["Customer data", "Analytics tools", "Feedback surveys"]
-                ),
-                CrisisStep(
-                    step_number=2,
-                    title="At-Risk Customer Identification",
-                    description="Identify customers showing churn signals. Prioritize high-value accounts.",
-                    priority="high",
-                    timeframe="48h",
-                    resources_needed=["CRM data", "Usage analytics"]
-                ),
-                CrisisStep(
-                    step_number=3,
-                    title="Retention Campaign",
-                    description="Launch targeted retention campaign with special offers and personalized outreach.",
-                    priority="high",
-                    timeframe="1 week",
-                    resources_needed=["Marketing team", "Special offers", "Communication tools"]
-                ),
-                CrisisStep(
-                    step_number=4,
-                    title="Product/Service Improvement",
-                    description="Address root causes identified in churn analysis. Fix product issues.",
-                    priority="medium",
-                    timeframe="2-4 weeks",
-                    resources_needed=["Product team", "Development resources"]
-                ),
-                CrisisStep(
-                    step_number=5,
-                    title="Customer Success Program",
-                    description="Implement proactive customer success program to prevent future churn.",
-                    priority="medium",
-                    timeframe="ongoing",
-                    resources_needed=["Customer success team", "Monitoring tools"]
-                )
-            ],
-            "resources": ["Customer success team", "Marketing team", "Product team", "Analytics tools"],
-            "contacts": ["Customer success manager", "Product manager", "Marketing lead"],
-            "estimated_resolution_time": "4-8 weeks"
-        }
-    }
-    
-    template = playbooks.get(request.crisis_type, playbooks["cash_flow"])
+    template = _TEMPLATES.get(request.crisis_type, _TEMPLATES["cash_flow"])
     
     return CrisisPlaybook(
         crisis_type=request.crisis_type,
@@ -300,37 +328,50 @@ def generate_template_playbook(request: CrisisRequest) -> CrisisPlaybook:
         resources=template["resources"],
         contacts=template["contacts"],
         estimated_resolution_time=template["estimated_resolution_time"],
-        generated_at=datetime.utcnow()
+        generated_at=utcnow()
     )
 
+_DEMO_REQUEST = CrisisRequest(
+    crisis_type="cash_flow",
+    description="Negative cash flow for 3 consecutive months, runway less than 2 months",
+    severity="high"
+)
+
+async def _build_demo_response() -> Tuple[CrisisResponse, bool]:
+    playbook, final = await _generate_playbook(_DEMO_REQUEST)
+    return CrisisResponse(
+        success=True,
+        data=playbook,
+        message="Crisis response playbook generated successfully"
+    ), final
+
+_demo = DemoCache(_build_demo_response)
+
 @router.get("/demo")
 async def get_demo_playbook():
     """
     Get a demo crisis response playbook.
     """
-    demo_request = CrisisRequest(
-        crisis_type="cash_flow",
-        description="Negative cash flow for 3 consecutive months, runway less than 2 months",
-        severity="high"
-    )
-    return await generate_crisis_playbook(demo_request)
+    return await _demo.get()
+
+_CRISIS_TYPES_BYTES = orjson.dumps({
+    "success": True,
+    "data": {
+        "crisis_types": [
+            {"id": "cash_flow", "name": "Cash Flow Crisis", "description": "Negative cash flow, low runway"},
+            {"id": "data_breach", "name": "Data Breach", "description": "Security breach, data exposure"},
+            {"id": "legal", "name": "Legal Issue", "description": "Lawsuits, compliance violations"},
+            {"id": "customer_loss", "name": "Customer Churn", "description": "High customer attrition"},
+            {"id": "reputation", "name": "Reputation Crisis", "description": "PR issues, negative publicity"},
+            {"id": "market_shift", "name": "Market Disruption", "description": "Sudden market changes"}
+        ]
+    },
+    "message": "Crisis types retrieved"
+})
 
 @router.get("/crisis-types")
 async def get_crisis_types():
     """
     Get list of supported crisis types.
     """
-    return {
-        "success": True,
-        "data": {
-            "crisis_types": [
-                {"id": "cash_flow", "name": "Cash Flow Crisis", "description": "Negative cash flow, low runway"},
-                {"id": "data_breach", "name": "Data Breach", "description": "Security breach, data exposure"},
-                {"id": "legal", "name": "Legal Issue", "description": "Lawsuits, compliance violations"},
-                {"id": "customer_loss", "name": "Customer Churn", "description": "High customer attrition"},
-                {"id": "reputation", "name": "Reputation Crisis", "description": "PR issues, negative publicity"},
-                {"id": "market_shift", "name": "Market Disruption", "description": "Sudden market changes"}
-            ]
-        },
-        "message": "Crisis types retrieved"
-    }
+    return Response(content=_CRISIS_TYPES_BYTES, media_type="application/json")
@@ -1,11 +1,61 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from typing import List, Optional, Tuple
 from datetime import datetime
-import requests
+import asyncio
+import bisect
+import httpx
+import ahocorasick
 import hashlib
+import logging
+import orjson
+from cachetools import TTLCache
+
+from app.core.cache import cache_get, cache_key, cache_set
+from app.core.demo_cache import DemoCache
+from app.core.utils import utcnow
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Security score cut-offs; a score at or above a threshold moves up one level.
+_SCORE_THRESHOLDS = (40, 60, 80)
+_RISK_LEVELS = ("critical", "high", "medium", "low")
+
+SUSPICIOUS_DOMAIN_KEYWORDS = ["free", "click", "win", "prize", "urgent"]
+URL_SHORTENERS = ["bit.ly", "tinyurl", "goo.gl"]
+
+def _build_automaton(words: List[str]) -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+_SUSPICIOUS_KEYWORD_AUTOMATON = _build_automaton(SUSPICIOUS_DOMAIN_KEYWORDS)
+_URL_SHORTENER_AUTOMATON = _build_automaton(URL_SHORTENERS)
+
+def _contains_any(automaton: ahocorasick.Automaton, text: str) -> bool:
+    return next(automaton.iter(text.lower()), None) is not None
+
+_httpx_client: Optional[httpx.AsyncClient] = None
+
+def get_httpx_client() -> httpx.AsyncClient:
+    """Return the outbound HTTP client, creating it on first use after startup."""
+    global _httpx_client
+    if _httpx_client is None:
+        _httpx_client = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            headers={"User-Agent": "VentureGuard-AI"}
+        )
+    return _httpx_client
+
+async def close_httpx_client() -> None:
+    global _httpx_client
+    if _httpx_client is not None:
+        await _httpx_client.aclose()
+        _httpx_client = None
 
 class CyberThreatRequest(BaseModel):
     domain: Optional[str] = Field(None, description="Domain to check")
@@ -13,11 +63,39 @@ class CyberThreatRequest(BaseModel):
     url: Optional[HttpUrl] = Field(None, description="URL to scan")
 
 class ThreatDetail(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     type: str
     severity: str
     description: str
     recommendation: str
 
+# Findings with fixed wording are built once and shared; ThreatDetail is frozen.
+_SSL_MISSING_THREAT = ThreatDetail(
+    type="ssl_missing",
+    severity="medium",
+    description="Domain does not use HTTPS",
+    recommendation="Implement SSL/TLS certificate for secure connections"
+)
+_SUSPICIOUS_DOMAIN_THREAT = ThreatDetail(
+    type="suspicious_domain",
+    severity="medium",
+    description="Domain contains suspicious keywords",
+    recommendation="Verify domain legitimacy before sharing sensitive information"
+)
+_INSECURE_CONNECTION_THREAT = ThreatDetail(
+    type="insecure_connection",
+    severity="high",
+    description="URL uses insecure HTTP protocol",
+    recommendation="Only use HTTPS connections for sensitive operations"
+)
+_URL_SHORTENER_THREAT = ThreatDetail(
+    type="url_shortener",
+    severity="low",
+    description="URL uses link shortener which may hide destination",
+    recommendation="Verify actual destination before clicking"
+)
+
 class CyberThreatResult(BaseModel):
     security_score: float = Field(..., description="Overall security score (0-100)")
     risk_level: str
@@ -25,7 +103,7 @@ class CyberThreatResult(BaseModel):
     threats: List[ThreatDetail]
     breach_found: bool = False
     breach_details: Optional[str] = None
-    checked_at: datetime = Field(default_factory=datetime.utcnow)
+    checked_at: datetime = Field(default_factory=utcnow)
 
 class CyberThreatResponse(BaseModel):
     success: bool = True
@@ -41,13 +119,19 @@ async def scan_cyber_threats(request: CyberThreatRequest):
     - SSL/TLS vulnerabilities
     - Malware detection
     """
+    response, _ = await _scan_with_status(request)
+    return response
+
+async def _scan_with_status(request: CyberThreatRequest) -> Tuple[CyberThreatResponse, bool]:
+    """Run a scan and report whether every upstream check gave a definitive answer."""
     threats = []
     security_score = 100.0
     breach_found = False
     breach_details = None
+    definitive = True
     
     if request.email:
-        breach_check = await check_email_breach(request.email)
+        breach_check, definitive = await _check_email_breach(request.email)
         if breach_check["found"]:
             breach_found = True
             breach_details = breach_check["details"]
@@ -71,14 +155,7 @@ async def scan_cyber_threats(request: CyberThreatRequest):
     
     security_score = max(security_score, 0)
     
-    if security_score >= 80:
-        risk_level = "low"
-    elif security_score >= 60:
-        risk_level = "medium"
-    elif security_score >= 40:
-        risk_level = "high"
-    else:
-        risk_level = "critical"
+    risk_level = _RISK_LEVELS[bisect.bisect_right(_SCORE_THRESHOLDS, security_score)]
     
     result = CyberThreatResult(
         security_score=round(security_score, 2),
@@ -87,99 +164,127 @@ async def scan_cyber_threats(request: CyberThreatRequest):
         threats=threats,
         breach_found=breach_found,
         breach_details=breach_details,
-        checked_at=datetime.utcnow()
+        checked_at=utcnow()
     )
     
     return CyberThreatResponse(
         success=True,
         data=result,
         message="Cyber threat scan completed"
-    )
+    ), definitive
+
+_breach_cache = TTLCache(maxsize=10_000, ttl=3600)
+_breach_cache_lock = asyncio.Lock()
 
 async def check_email_breach(email: str) -> dict:
     """
     Check if email has been in data breaches using HaveIBeenPwned API.
+    
+    Definitive answers are cached for an hour, keyed by a hash of the
+    normalized address so plaintext emails are never held in memory.
     """
+    result, _ = await _check_email_breach(email)
+    return result
+
+async def _check_email_breach(email: str) -> Tuple[dict, bool]:
+    email = email.strip().lower()
+    key = hashlib.sha1(email.encode()).digest()
+    
+    async with _breach_cache_lock:
+        cached = _breach_cache.get(key)
+    if cached is not None:
+        return cached, True
+    
+    redis_key = cache_key("hibp", email)
+    shared = await cache_get(redis_key)
+    if shared is not None:
+        result, cacheable = orjson.loads(shared), True
+    else:
+        result, cacheable = await _lookup_email_breach(email)
+        if cacheable:
+            await cache_set(redis_key, orjson.dumps(result), ttl=3600)
+    
+    if cacheable:
+        async with _breach_cache_lock:
+            _breach_cache[key] = result
+    return result, cacheable
+
+async def _lookup_email_breach(email: str) -> Tuple[dict, bool]:
     try:
         url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}"
-        headers = {
-            "User-Agent": "VentureGuard-AI",
-        }
-        
-        response = requests.get(url, headers=headers, timeout=5)
+        response = await get_httpx_client().get(url)
         
         if response.status_code == 200:
-            breaches = response.json()
+            breaches = orjson.loads(response.content)
             return {
                 "found": True,
                 "breach_count": len(breaches),
                 "details": f"Found in {len(breaches)} breaches: {', '.join([b['Name'] for b in breaches[:3]])}"
-            }
+            }, True
         elif response.status_code == 404:
-            return {"found": False, "breach_count": 0, "details": None}
+            return {"found": False, "breach_count": 0, "details": None}, True
         else:
-            return {"found": False, "breach_count": 0, "details": "Could not check"}
+            return {"found": False, "breach_count": 0, "details": "Could not check"}, False
     except Exception as e:
-        print(f"Breach check error: {e}")
-        return {"found": False, "breach_count": 0, "details": "Check unavailable"}
+        logger.warning("Breach check error: %s", e)
+        return {"found": False, "breach_count": 0, "details": "Check unavailable"}, False
 
 def check_domain_security(domain: str) -> List[ThreatDetail]:
     """
     Check domain for security issues.
     """
-    threats = []
-    
-    if not domain.startswith("https://"):
-        threats.append(ThreatDetail(
-            type="ssl_missing",
-            severity="medium",
-            description="Domain does not use HTTPS",
-            recommendation="Implement SSL/TLS certificate for secure connections"
-        ))
-    
-    suspicious_keywords = ["free", "click", "win", "prize", "urgent"]
-    if any(keyword in domain.lower() for keyword in suspicious_keywords):
-        threats.append(ThreatDetail(
-            type="suspicious_domain",
-            severity="medium",
-            description="Domain contains suspicious keywords",
-            recommendation="Verify domain legitimacy before sharing sensitive information"
-        ))
-    
-    return threats
+    return check_domains([domain])[0]
+
+def check_domains(domains: List[str]) -> List[List[ThreatDetail]]:
+    """
+    Check a batch of domains for security issues, one threat list per domain.
+    """
+    results = []
+    for domain in domains:
+        threats = []
+        
+        if not domain.startswith("https://"):
+            threats.append(_SSL_MISSING_THREAT)
+        
+        if _contains_any(_SUSPICIOUS_KEYWORD_AUTOMATON, domain):
+            threats.append(_SUSPICIOUS_DOMAIN_THREAT)
+        
+        results.append(threats)
+    return results
 
 def check_url_safety(url: str) -> List[ThreatDetail]:
     """
     Check URL for safety issues.
     """
-    threats = []
-    
-    if not url.startswith("https://"):
-        threats.append(ThreatDetail(
-            type="insecure_connection",
-            severity="high",
-            description="URL uses insecure HTTP protocol",
-            recommendation="Only use HTTPS connections for sensitive operations"
-        ))
-    
-    suspicious_patterns = ["bit.ly", "tinyurl", "goo.gl"]
-    if any(pattern in url.lower() for pattern in suspicious_patterns):
-        threats.append(ThreatDetail(
-            type="url_shortener",
-            severity="low",
-            description="URL uses link shortener which may hide destination",
-            recommendation="Verify actual destination before clicking"
-        ))
-    
-    return threats
+    return check_urls([url])[0]
+
+def check_urls(urls: List[str]) -> List[List[ThreatDetail]]:
+    """
+    Check a batch of URLs for safety issues, one threat list per URL.
+    """
+    results = []
+    for url in urls:
+        threats = []
+        
+        if not url.startswith("https://"):
+            threats.append(_INSECURE_CONNECTION_THREAT)
+        
+        if _contains_any(_URL_SHORTENER_AUTOMATON, url):
+            threats.append(_URL_SHORTENER_THREAT)
+        
+        results.append(threats)
+    return results
+
+_DEMO_REQUEST = CyberThreatRequest(
+    domain="http://example-business.com",
+    email="test@example.com"
+)
+
+_demo = DemoCache(lambda: _scan_with_status(_DEMO_REQUEST))
 
 @router.get("/demo")
 async def get_demo_scan():
     """
     Get a demo cyber threat scan.
     """
-    demo_request = CyberThreatRequest(
-        domain="http://example-business.com",
-        email="test@example.com"
-    )
-    return await scan_cyber_threats(demo_request)
+    return await _demo.get()
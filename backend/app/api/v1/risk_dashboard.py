@@ -1,8 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from typing import List, Dict
 from datetime import datetime, timedelta
 import random
+import time
+import orjson
+
+from app.core.cache import cache_delete_matching, cache_get, cache_set
+from app.core.utils import utcnow
 
 router = APIRouter()
 
@@ -42,163 +47,140 @@ class RiskDashboardResponse(BaseModel):
     data: RiskDashboardData
     message: str
 
+# Static dashboard skeleton; only timestamps are filled in per request.
+_RISK_METRICS_TEMPLATE = [
+    {"category": "Business Health", "score": 65.0, "level": "medium", "trend": "declining"},
+    {"category": "Cyber Security", "score": 45.0, "level": "high", "trend": "stable"},
+    {"category": "Financial", "score": 55.0, "level": "medium", "trend": "improving"},
+    {"category": "Legal/Compliance", "score": 30.0, "level": "low", "trend": "stable"},
+    {"category": "Market", "score": 50.0, "level": "medium", "trend": "declining"}
+]
+
+# Record ages shared by the alert and timeline templates.
+_OFFSET_2H = timedelta(hours=2)
+_OFFSET_1D = timedelta(days=1)
+_OFFSET_3D = timedelta(days=3)
+_OFFSET_7D = timedelta(days=7)
+
+# (alert fields, age of the alert)
+_ALERTS_TEMPLATE = [
+    ({
+        "id": "alert_001",
+        "severity": "high",
+        "category": "cyber",
+        "title": "Data Breach Detected",
+        "description": "Email found in recent data breach",
+        "recommendation": "Change passwords and enable 2FA immediately",
+        "is_resolved": False
+    }, _OFFSET_2H),
+    ({
+        "id": "alert_002",
+        "severity": "medium",
+        "category": "financial",
+        "title": "Cash Flow Warning",
+        "description": "Negative cash flow trend detected",
+        "recommendation": "Review expenses and accelerate receivables",
+        "is_resolved": False
+    }, _OFFSET_1D),
+    ({
+        "id": "alert_003",
+        "severity": "medium",
+        "category": "legal",
+        "title": "Contract Risk Identified",
+        "description": "Unfair termination clause in supplier contract",
+        "recommendation": "Renegotiate contract terms before renewal",
+        "is_resolved": False
+    }, _OFFSET_3D)
+]
+
+# (event fields, age of the event)
+_TIMELINE_TEMPLATE = [
+    ({"event_type": "threat_detected", "description": "Data breach exposure identified", "impact": "high"},
+     _OFFSET_2H),
+    ({"event_type": "risk_increased", "description": "Cash flow risk elevated to medium", "impact": "medium"},
+     _OFFSET_1D),
+    ({"event_type": "contract_analyzed", "description": "Supplier contract analysis completed", "impact": "medium"},
+     _OFFSET_3D),
+    ({"event_type": "risk_decreased", "description": "Cyber security score improved", "impact": "positive"},
+     _OFFSET_7D)
+]
+
+def _overall_risk_level(score: float) -> str:
+    if score >= 70:
+        return "critical"
+    elif score >= 50:
+        return "high"
+    elif score >= 30:
+        return "medium"
+    else:
+        return "low"
+
+_OVERALL_SCORE = sum(m["score"] for m in _RISK_METRICS_TEMPLATE) / len(_RISK_METRICS_TEMPLATE)
+_OVERALL_LEVEL = _overall_risk_level(_OVERALL_SCORE)
+
+_OVERVIEW_CACHE_PREFIX = "risk:overview:"
+
 @router.get("/overview", response_model=RiskDashboardResponse)
 async def get_risk_overview():
     """
     Get comprehensive risk dashboard overview with all risk dimensions.
-    """
-    risk_metrics = [
-        RiskMetric(
-            category="Business Health",
-            score=65.0,
-            level="medium",
-            trend="declining",
-            last_updated=datetime.utcnow()
-        ),
-        RiskMetric(
-            category="Cyber Security",
-            score=45.0,
-            level="high",
-            trend="stable",
-            last_updated=datetime.utcnow()
-        ),
-        RiskMetric(
-            category="Financial",
-            score=55.0,
-            level="medium",
-            trend="improving",
-            last_updated=datetime.utcnow()
-        ),
-        RiskMetric(
-            category="Legal/Compliance",
-            score=30.0,
-            level="low",
-            trend="stable",
-            last_updated=datetime.utcnow()
-        ),
-        RiskMetric(
-            category="Market",
-            score=50.0,
-            level="medium",
-            trend="declining",
-            last_updated=datetime.utcnow()
-        )
-    ]
-    
-    overall_score = sum(m.score for m in risk_metrics) / len(risk_metrics)
-    
-    if overall_score >= 70:
-        overall_level = "critical"
-    elif overall_score >= 50:
-        overall_level = "high"
-    elif overall_score >= 30:
-        overall_level = "medium"
-    else:
-        overall_level = "low"
     
-    active_alerts = [
-        RiskAlert(
-            id="alert_001",
-            severity="high",
-            category="cyber",
-            title="Data Breach Detected",
-            description="Email found in recent data breach",
-            recommendation="Change passwords and enable 2FA immediately",
-            created_at=datetime.utcnow() - timedelta(hours=2),
-            is_resolved=False
-        ),
-        RiskAlert(
-            id="alert_002",
-            severity="medium",
-            category="financial",
-            title="Cash Flow Warning",
-            description="Negative cash flow trend detected",
-            recommendation="Review expenses and accelerate receivables",
-            created_at=datetime.utcnow() - timedelta(days=1),
-            is_resolved=False
-        ),
-        RiskAlert(
-            id="alert_003",
-            severity="medium",
-            category="legal",
-            title="Contract Risk Identified",
-            description="Unfair termination clause in supplier contract",
-            recommendation="Renegotiate contract terms before renewal",
-            created_at=datetime.utcnow() - timedelta(days=3),
-            is_resolved=False
-        )
-    ]
-    
-    timeline = [
-        RiskTimelineEvent(
-            date=datetime.utcnow() - timedelta(hours=2),
-            event_type="threat_detected",
-            description="Data breach exposure identified",
-            impact="high"
-        ),
-        RiskTimelineEvent(
-            date=datetime.utcnow() - timedelta(days=1),
-            event_type="risk_increased",
-            description="Cash flow risk elevated to medium",
-            impact="medium"
-        ),
-        RiskTimelineEvent(
-            date=datetime.utcnow() - timedelta(days=3),
-            event_type="contract_analyzed",
-            description="Supplier contract analysis completed",
-            impact="medium"
-        ),
-        RiskTimelineEvent(
-            date=datetime.utcnow() - timedelta(days=7),
-            event_type="risk_decreased",
-            description="Cyber security score improved",
-            impact="positive"
-        )
-    ]
-    
-    dashboard_data = RiskDashboardData(
-        overall_risk_score=round(overall_score, 2),
-        overall_risk_level=overall_level,
-        risk_metrics=risk_metrics,
-        active_alerts=active_alerts,
-        timeline=timeline,
-        last_updated=datetime.utcnow()
-    )
+    The rendered payload is cached in Redis per minute.
+    """
+    key = f"{_OVERVIEW_CACHE_PREFIX}{int(time.time() // 60)}"
+    cached = await cache_get(key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
-    return RiskDashboardResponse(
+    # Everything here is server-built from the templates, so skip validation.
+    now = utcnow()
+    response = RiskDashboardResponse.model_construct(
         success=True,
-        data=dashboard_data,
+        data=RiskDashboardData.model_construct(
+            overall_risk_score=round(_OVERALL_SCORE, 2),
+            overall_risk_level=_OVERALL_LEVEL,
+            risk_metrics=[RiskMetric.model_construct(**metric, last_updated=now) for metric in _RISK_METRICS_TEMPLATE],
+            active_alerts=[RiskAlert.model_construct(**alert, created_at=now - age) for alert, age in _ALERTS_TEMPLATE],
+            timeline=[RiskTimelineEvent.model_construct(**event, date=now - age) for event, age in _TIMELINE_TEMPLATE],
+            last_updated=now
+        ),
         message="Risk dashboard data retrieved successfully"
     )
+    payload = orjson.dumps(response.model_dump())
+    await cache_set(key, payload, ttl=60)
+    return Response(content=payload, media_type="application/json")
+
+_ACTIVE_ALERTS_BYTES = orjson.dumps({
+    "success": True,
+    "data": {
+        "total_alerts": 3,
+        "critical": 0,
+        "high": 1,
+        "medium": 2,
+        "low": 0
+    },
+    "message": "Active alerts retrieved"
+})
 
 @router.get("/alerts")
 async def get_active_alerts():
     """
     Get all active risk alerts.
     """
-    return {
-        "success": True,
-        "data": {
-            "total_alerts": 3,
-            "critical": 0,
-            "high": 1,
-            "medium": 2,
-            "low": 0
-        },
-        "message": "Active alerts retrieved"
-    }
+    return Response(content=_ACTIVE_ALERTS_BYTES, media_type="application/json")
 
 @router.post("/alerts/{alert_id}/resolve")
 async def resolve_alert(alert_id: str):
     """
     Mark an alert as resolved.
     """
+    await cache_delete_matching(f"{_OVERVIEW_CACHE_PREFIX}*")
     return {
         "success": True,
         "data": {
             "alert_id": alert_id,
             "status": "resolved",
-            "resolved_at": datetime.utcnow()
+            "resolved_at": utcnow()
         },
         "message": "Alert resolved successfully"
     }
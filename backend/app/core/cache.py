@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import time
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError, TimeoutError as RedisTimeoutError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from blake3 import blake3 as _hash
+except ImportError:
+    _hash = hashlib.sha256
+
+_redis_client: Optional[redis.Redis] = None
+
+def get_redis_client() -> redis.Redis:
+    """
+    Return the Redis client, creating it on first use after startup. Short
+    timeouts make an unreachable Redis degrade to a cache miss.
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+    return _redis_client
+
+async def close_redis_client() -> None:
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+# After a connection failure, skip Redis for this long instead of paying the
+# socket timeout on every request while it is unreachable.
+REDIS_COOLDOWN_SECONDS = 30.0
+_redis_retry_at = 0.0
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _redis_retry_at
+
+def _record_failure(action: str, error: Exception) -> None:
+    global _redis_retry_at
+    if isinstance(error, (RedisConnectionError, RedisTimeoutError, OSError)):
+        _redis_retry_at = time.monotonic() + REDIS_COOLDOWN_SECONDS
+        logger.warning("Cache %s failed, skipping Redis for %.0fs: %s", action, REDIS_COOLDOWN_SECONDS, error)
+    else:
+        logger.warning("Cache %s failed: %s", action, error)
+
+def content_digest(*parts: str) -> bytes:
+    """Hash request content so raw emails/contract text never become cache keys."""
+    return _hash("\x1f".join(parts).encode()).digest()
+
+def cache_key(namespace: str, *parts: str) -> str:
+    return f"{namespace}:{content_digest(*parts).hex()}"
+
+async def cache_get(key: str) -> Optional[bytes]:
+    if not _redis_available():
+        return None
+    try:
+        return await get_redis_client().get(key)
+    except (RedisError, OSError) as e:
+        _record_failure("read", e)
+        return None
+
+async def cache_set(key: str, value: bytes, ttl: int = 3600) -> None:
+    if not _redis_available():
+        return
+    try:
+        await get_redis_client().set(key, value, ex=ttl)
+    except (RedisError, OSError) as e:
+        _record_failure("write", e)
+
+async def cache_delete_matching(pattern: str) -> None:
+    if not _redis_available():
+        return
+    try:
+        client = get_redis_client()
+        async for key in client.scan_iter(match=pattern):
+            await client.delete(key)
+    except (RedisError, OSError) as e:
+        _record_failure("invalidation", e)
@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 import os
 
@@ -21,8 +21,11 @@ class Settings(BaseSettings):
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3001"]
     RATE_LIMIT_PER_MINUTE: int = 60
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Number of uvicorn worker processes; also read by uvicorn as its --workers default.
+    WEB_CONCURRENCY: int = 1
+    # Processes per worker for splitting large PDFs; 0 derives it from WEB_CONCURRENCY.
+    PDF_POOL_WORKERS: int = 0
+    
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 settings = Settings()
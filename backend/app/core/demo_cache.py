@@ -0,0 +1,28 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class DemoCache(Generic[T]):
+    """
+    Lazily build a demo endpoint's response and keep it for the life of the process.
+
+    The builder returns the response and whether it may be cached. Responses
+    produced by a fallback after an AI or upstream failure are served but not
+    kept, so the next request tries again.
+    """
+    def __init__(self, build: Callable[[], Awaitable[Tuple[T, bool]]]):
+        self._build = build
+        self._value: Optional[T] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> T:
+        if self._value is not None:
+            return self._value
+        async with self._lock:
+            if self._value is not None:
+                return self._value
+            value, cacheable = await self._build()
+            if cacheable:
+                self._value = value
+            return value
@@ -0,0 +1,45 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Tuple
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+# Records beyond this backlog are dropped rather than blocking request handling.
+LOG_QUEUE_SIZE = 10_000
+# Loggers that follow the configured level; everything else logs warnings and up.
+APP_LOGGERS = ("app", "main")
+# Chatty client libraries whose debug output would crowd application records out of the queue.
+QUIET_LOGGERS = ("httpx", "httpcore", "hpack", "openai", "multipart")
+
+class _DroppingQueueHandler(QueueHandler):
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+def setup_logging(level: int = logging.INFO) -> Tuple[QueueHandler, QueueListener]:
+    """
+    Route application logging through a bounded queue.
+    
+    Request handlers only enqueue records; a background thread started by
+    the returned listener does the actual stream I/O. On shutdown, remove
+    the returned handler from the root logger before stopping the listener.
+    """
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    root = logging.getLogger()
+    root.setLevel(logging.WARNING)
+    for name in APP_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    handler = _DroppingQueueHandler(log_queue)
+    root.addHandler(handler)
+    
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return handler, listener
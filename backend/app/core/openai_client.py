@@ -0,0 +1,26 @@
+import httpx
+from openai import AsyncOpenAI
+from typing import Optional
+
+from app.core.config import settings
+
+_openai_client: Optional[AsyncOpenAI] = None
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide OpenAI client, creating it on first use after
+    startup; HTTP/2 lets concurrent completions share a connection.
+    """
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(http2=True, limits=httpx.Limits(max_connections=100))
+        )
+    return _openai_client
+
+async def close_openai_client() -> None:
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
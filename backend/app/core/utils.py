@@ -0,0 +1,5 @@
+from datetime import datetime, timezone
+
+def utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
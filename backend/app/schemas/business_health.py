@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Optional
 from datetime import datetime
 
+from app.core.utils import utcnow
+
 class BusinessMetrics(BaseModel):
     monthly_revenue: List[float] = Field(..., description="Monthly revenue for past 6-12 months")
     monthly_expenses: List[float] = Field(..., description="Monthly expenses for past 6-12 months")
@@ -11,15 +13,24 @@ class BusinessMetrics(BaseModel):
     business_age_months: Optional[int] = Field(None, description="Business age in months")
     employee_count: Optional[int] = Field(None, description="Number of employees")
 
+class PredictionPayload(BaseModel):
+    next_month_cash_flow: Optional[float] = Field(None, description="Projected cash flow for next month")
+    cash_flow_trend: Optional[str] = Field(None, description="Cash flow trend: improving, declining")
+    revenue_trend: Optional[str] = Field(None, description="Revenue trend: growing, declining")
+    projected_revenue_change: Optional[str] = Field(None, description="Projected monthly revenue change, as a percentage")
+    runway_months: Optional[float] = Field(None, description="Estimated runway in months")
+    cash_crisis_warning: Optional[str] = Field(None, description="Set when cash flow is not positive")
+    expected_customer_loss_30d: Optional[int] = Field(None, description="Expected customers lost in the next 30 days")
+
 class RiskPrediction(BaseModel):
     risk_score: float = Field(..., description="Overall risk score (0-100)")
     risk_level: str = Field(..., description="Risk level: low, medium, high, critical")
     cash_flow_risk: float = Field(..., description="Cash flow risk score (0-100)")
     market_risk: float = Field(..., description="Market risk score (0-100)")
     operational_risk: float = Field(..., description="Operational risk score (0-100)")
-    predictions: Dict[str, any] = Field(..., description="Specific predictions")
+    predictions: PredictionPayload = Field(..., description="Specific predictions")
     recommendations: List[str] = Field(..., description="Actionable recommendations")
-    predicted_at: datetime = Field(default_factory=datetime.utcnow)
+    predicted_at: datetime = Field(default_factory=utcnow)
 
 class BusinessHealthResponse(BaseModel):
     success: bool = True
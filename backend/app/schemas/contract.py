@@ -1,12 +1,16 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 from datetime import datetime
 
+from app.core.utils import utcnow
+
 class ContractAnalysisRequest(BaseModel):
     contract_text: str = Field(..., description="Contract text to analyze")
     contract_type: Optional[str] = Field(None, description="Type: supplier, client, partnership, employment")
 
 class ContractIssue(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     severity: str = Field(..., description="Severity: critical, high, medium, low")
     category: str = Field(..., description="Category: legal, financial, liability, termination, etc")
     issue: str = Field(..., description="Description of the issue")
@@ -20,7 +24,7 @@ class ContractAnalysisResult(BaseModel):
     positive_aspects: List[str] = Field(..., description="Favorable terms found")
     missing_clauses: List[str] = Field(..., description="Important missing clauses")
     summary: str = Field(..., description="Executive summary")
-    analyzed_at: datetime = Field(default_factory=datetime.utcnow)
+    analyzed_at: datetime = Field(default_factory=utcnow)
 
 class ContractAnalysisResponse(BaseModel):
     success: bool = True
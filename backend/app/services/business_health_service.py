@@ -1,83 +1,109 @@
+import asyncio
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from app.schemas.business_health import BusinessMetrics, RiskPrediction
+from app.core.utils import utcnow
+from app.schemas.business_health import BusinessMetrics, PredictionPayload, RiskPrediction
+from app.services.scoring_rules import calculate_operational_risk, get_risk_level
 
-class BusinessHealthService:
-    def __init__(self):
-        self.scaler = StandardScaler()
+@lru_cache(maxsize=128)
+def _centered_x(n: int) -> Tuple[np.ndarray, float]:
+    """Centred 0..n-1 abscissa and its sum of squares, built once per series length."""
+    x = np.arange(n) - (n - 1) / 2
+    x.flags.writeable = False
+    return x, n * (n * n - 1) / 12
+
+def _slope(y: np.ndarray) -> float:
+    """
+    Least-squares slope of y against 0..n-1 (closed form of np.polyfit(..., 1)[0]).
     
-    def predict_business_health(self, metrics: BusinessMetrics) -> RiskPrediction:
+    A flat series returns exactly 0.0; polyfit returned rounding noise of
+    either sign, so flat series were sometimes reported as declining.
+    """
+    if not np.ptp(y):
+        return 0.0
+    x, xx = _centered_x(len(y))
+    return float(x @ y / xx)
+
+class BusinessHealthService:
+    async def predict_business_health(self, metrics: BusinessMetrics) -> RiskPrediction:
         """
         Predict business health and risks using AI/ML models.
         """
-        revenue = np.array(metrics.monthly_revenue)
-        expenses = np.array(metrics.monthly_expenses)
+        revenue = np.asarray(metrics.monthly_revenue, dtype=np.float64)
+        expenses = np.asarray(metrics.monthly_expenses, dtype=np.float64)
         cash_flow = revenue - expenses
         
-        cash_flow_risk = self._calculate_cash_flow_risk(cash_flow, revenue, expenses)
-        market_risk = self._calculate_market_risk(revenue, metrics)
-        operational_risk = self._calculate_operational_risk(metrics)
+        # Series statistics shared by the scoring and prediction steps, computed once.
+        cf_slope = _slope(cash_flow) if len(cash_flow) >= 3 else None
+        rev_slope = _slope(revenue) if len(revenue) >= 3 else None
+        cf_tail_mean = cash_flow[-3:].mean() if len(cash_flow) >= 3 else cash_flow[-1]
+        exp_tail_mean = expenses[-3:].mean() if len(expenses) >= 3 else expenses[-1]
+        rev_mean = revenue.mean()
+        
+        # The two numpy-backed scores are independent; run them off the event loop together.
+        cash_flow_risk, market_risk = await asyncio.gather(
+            asyncio.to_thread(self._calculate_cash_flow_risk, cash_flow, cf_slope, cf_tail_mean, exp_tail_mean),
+            asyncio.to_thread(self._calculate_market_risk, revenue, rev_slope, rev_mean, metrics)
+        )
+        operational_risk = calculate_operational_risk(metrics.employee_count, metrics.business_age_months)
         
         overall_risk = (cash_flow_risk * 0.5 + market_risk * 0.3 + operational_risk * 0.2)
         
-        risk_level = self._get_risk_level(overall_risk)
+        risk_level = get_risk_level(overall_risk)
         
-        predictions = self._generate_predictions(cash_flow, revenue, expenses, metrics)
+        predictions = self._generate_predictions(
+            cash_flow, cf_slope, rev_slope, rev_mean, cf_tail_mean, exp_tail_mean, metrics
+        )
         recommendations = self._generate_recommendations(
             overall_risk, cash_flow_risk, market_risk, operational_risk, predictions
         )
         
-        return RiskPrediction(
-            risk_score=round(overall_risk, 2),
+        # All fields are computed here, not taken from the caller; skip validation.
+        return RiskPrediction.model_construct(
+            risk_score=float(round(overall_risk, 2)),
             risk_level=risk_level,
-            cash_flow_risk=round(cash_flow_risk, 2),
-            market_risk=round(market_risk, 2),
-            operational_risk=round(operational_risk, 2),
-            predictions=predictions,
+            cash_flow_risk=float(round(cash_flow_risk, 2)),
+            market_risk=float(round(market_risk, 2)),
+            operational_risk=float(round(operational_risk, 2)),
+            predictions=PredictionPayload.model_construct(**predictions),
             recommendations=recommendations,
-            predicted_at=datetime.utcnow()
+            predicted_at=utcnow()
         )
     
-    def _calculate_cash_flow_risk(self, cash_flow: np.ndarray, revenue: np.ndarray, expenses: np.ndarray) -> float:
+    def _calculate_cash_flow_risk(self, cash_flow: np.ndarray, cf_slope: Optional[float],
+                                  cf_tail_mean: float, exp_tail_mean: float) -> float:
         """Calculate cash flow risk score (0-100)."""
         if len(cash_flow) < 3:
             return 50.0
         
         risk_score = 0.0
         
-        negative_months = np.sum(cash_flow < 0)
+        negative_months = np.count_nonzero(cash_flow < 0)
         if negative_months > 0:
             risk_score += (negative_months / len(cash_flow)) * 40
         
-        trend = np.polyfit(range(len(cash_flow)), cash_flow, 1)[0]
-        if trend < 0:
-            risk_score += min(abs(trend) / np.mean(np.abs(cash_flow)) * 30, 30)
+        if cf_slope < 0:
+            risk_score += min(abs(cf_slope) / np.abs(cash_flow).mean() * 30, 30)
         
-        recent_cash_flow = cash_flow[-3:]
-        if np.mean(recent_cash_flow) < 0:
+        if cf_tail_mean < 0:
             risk_score += 20
         
-        burn_rate = np.mean(expenses[-3:])
-        avg_cash_flow = np.mean(cash_flow[-3:])
-        if avg_cash_flow > 0:
-            runway_months = avg_cash_flow / burn_rate * 12
+        if cf_tail_mean > 0:
+            runway_months = cf_tail_mean / exp_tail_mean * 12
             if runway_months < 3:
                 risk_score += 10
         
         return min(risk_score, 100.0)
     
-    def _calculate_market_risk(self, revenue: np.ndarray, metrics: BusinessMetrics) -> float:
+    def _calculate_market_risk(self, revenue: np.ndarray, rev_slope: Optional[float],
+                               rev_mean: float, metrics: BusinessMetrics) -> float:
         """Calculate market risk score (0-100)."""
         risk_score = 0.0
         
-        if len(revenue) >= 3:
-            revenue_trend = np.polyfit(range(len(revenue)), revenue, 1)[0]
-            if revenue_trend < 0:
-                risk_score += min(abs(revenue_trend) / np.mean(revenue) * 40, 40)
+        if rev_slope is not None and rev_slope < 0:
+            risk_score += min(abs(rev_slope) / rev_mean * 40, 40)
         
         if len(revenue) >= 2:
             recent_decline = (revenue[-1] - revenue[-2]) / revenue[-2]
@@ -92,48 +118,26 @@ class BusinessHealthService:
         
         return min(risk_score, 100.0)
     
-    def _calculate_operational_risk(self, metrics: BusinessMetrics) -> float:
-        """Calculate operational risk score (0-100)."""
-        risk_score = 30.0
-        
-        if metrics.employee_count:
-            if metrics.employee_count < 3:
-                risk_score += 20
-            elif metrics.employee_count > 50:
-                risk_score -= 10
-        
-        if metrics.business_age_months:
-            if metrics.business_age_months < 6:
-                risk_score += 20
-            elif metrics.business_age_months > 24:
-                risk_score -= 10
-        
-        return max(min(risk_score, 100.0), 0.0)
-    
-    def _generate_predictions(self, cash_flow: np.ndarray, revenue: np.ndarray, 
-                            expenses: np.ndarray, metrics: BusinessMetrics) -> Dict:
+    def _generate_predictions(self, cash_flow: np.ndarray, cf_slope: Optional[float],
+                            rev_slope: Optional[float], rev_mean: float, cf_tail_mean: float,
+                            exp_tail_mean: float, metrics: BusinessMetrics) -> Dict:
         """Generate specific predictions for the next 30-90 days."""
         predictions = {}
         
-        if len(cash_flow) >= 3:
-            trend = np.polyfit(range(len(cash_flow)), cash_flow, 1)[0]
-            next_month_cf = cash_flow[-1] + trend
+        if cf_slope is not None:
+            next_month_cf = cash_flow[-1] + cf_slope
             predictions["next_month_cash_flow"] = float(round(next_month_cf, 2))
-            predictions["cash_flow_trend"] = "declining" if trend < 0 else "improving"
+            predictions["cash_flow_trend"] = "declining" if cf_slope < 0 else "improving"
         
-        if len(revenue) >= 3:
-            revenue_trend = np.polyfit(range(len(revenue)), revenue, 1)[0]
-            predictions["revenue_trend"] = "declining" if revenue_trend < 0 else "growing"
-            predictions["projected_revenue_change"] = f"{round(revenue_trend / np.mean(revenue) * 100, 1)}%"
+        if rev_slope is not None:
+            predictions["revenue_trend"] = "declining" if rev_slope < 0 else "growing"
+            predictions["projected_revenue_change"] = f"{round(rev_slope / rev_mean * 100, 1)}%"
         
-        avg_cash_flow = np.mean(cash_flow[-3:]) if len(cash_flow) >= 3 else cash_flow[-1]
-        avg_expenses = np.mean(expenses[-3:]) if len(expenses) >= 3 else expenses[-1]
-        
-        if avg_cash_flow > 0:
-            runway_months = (avg_cash_flow * len(cash_flow)) / avg_expenses
+        if cf_tail_mean > 0:
+            runway_months = (cf_tail_mean * len(cash_flow)) / exp_tail_mean
             predictions["runway_months"] = round(runway_months, 1)
         else:
-            predictions["runway_months"] = 0
+            predictions["runway_months"] = 0.0
             predictions["cash_crisis_warning"] = "Immediate action required"
         
         if metrics.customer_churn_rate:
@@ -179,14 +183,3 @@ class BusinessHealthService:
             recommendations.append("📈 Continue monitoring key metrics and maintain current trajectory.")
         
         return recommendations
-    
-    def _get_risk_level(self, risk_score: float) -> str:
-        """Convert risk score to risk level."""
-        if risk_score >= 75:
-            return "critical"
-        elif risk_score >= 50:
-            return "high"
-        elif risk_score >= 25:
-            return "medium"
-        else:
-            return "low"
@@ -1,101 +1,192 @@
-import openai
-from typing import List, Dict
+import ahocorasick
+import asyncio
+from cachetools import LRUCache
+from typing import List, Dict, Optional, Tuple
 import json
-import re
-from datetime import datetime
+import logging
+import orjson
 
+from app.core.cache import cache_get, cache_key, cache_set
 from app.core.config import settings
+from app.core.openai_client import get_openai_client
+from app.core.utils import utcnow
 from app.schemas.contract import ContractAnalysisResult, ContractIssue
+from app.services.scoring_rules import get_risk_level
 
-class ContractAnalyzerService:
-    def __init__(self):
-        openai.api_key = settings.OPENAI_API_KEY
-    
-    async def analyze_contract(self, contract_text: str, contract_type: str = None) -> ContractAnalysisResult:
-        """
-        Analyze contract using GPT-4 to identify risks, unfair terms, and missing clauses.
-        """
-        if not settings.OPENAI_API_KEY:
-            return self._fallback_analysis(contract_text)
-        
-        try:
-            analysis = await self._gpt4_analysis(contract_text, contract_type)
-            return analysis
-        except Exception as e:
-            print(f"GPT-4 analysis failed: {e}")
-            return self._fallback_analysis(contract_text)
-    
-    async def _gpt4_analysis(self, contract_text: str, contract_type: str = None) -> ContractAnalysisResult:
-        """Use GPT-4 to analyze contract."""
-        
-        prompt = f"""You are a legal AI assistant specializing in contract analysis for small businesses and entrepreneurs. 
-Analyze the following contract and identify:
+logger = logging.getLogger(__name__)
+
+RED_FLAGS = {
+    "non-compete": ("high", "legal", "Non-compete clause detected"),
+    "indemnif": ("high", "liability", "Indemnification clause requires review"),
+    "unlimited liability": ("critical", "liability", "Unlimited liability clause found"),
+    "automatic renewal": ("medium", "termination", "Automatic renewal clause detected"),
+    "no termination": ("high", "termination", "Difficult termination terms"),
+    "penalty": ("medium", "financial", "Penalty clauses present"),
+    "late fee": ("medium", "financial", "Late fee provisions found"),
+    "exclusive": ("medium", "legal", "Exclusivity clause detected"),
+    "confidential": ("low", "confidentiality", "Confidentiality obligations present"),
+    "intellectual property": ("medium", "intellectual_property", "IP assignment clause found"),
+}
+
+IMPORTANT_CLAUSES = [
+    "dispute resolution", "termination", "liability", "payment terms",
+    "confidentiality", "intellectual property"
+]
 
-1. CRITICAL ISSUES: Unfair terms, hidden risks, one-sided clauses
+# Report labels for missing clauses, formatted once rather than per request.
+_MISSING_CLAUSE_LABELS = {clause: f"{clause.title()} clause" for clause in IMPORTANT_CLAUSES}
+
+POSITIVE_TERMS = {
+    "mutual": "Contains mutual obligations",
+    "reasonable": "Uses reasonable standards",
+}
+
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    """One automaton over every keyword the fallback looks for, matched in a single pass."""
+    automaton = ahocorasick.Automaton()
+    for keyword in {*RED_FLAGS, *IMPORTANT_CLAUSES, *POSITIVE_TERMS}:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+_SYSTEM_PROMPT = "You are an expert legal AI assistant specializing in contract analysis for entrepreneurs and small businesses."
+
+_ANALYSIS_INSTRUCTIONS = """1. CRITICAL ISSUES: Unfair terms, hidden risks, one-sided clauses
 2. LEGAL RISKS: Liability issues, termination clauses, dispute resolution
 3. FINANCIAL RISKS: Payment terms, penalties, hidden costs
 4. MISSING CLAUSES: Important protections that should be included
-5. POSITIVE ASPECTS: Favorable terms for the entrepreneur
+5. POSITIVE ASPECTS: Favorable terms for the entrepreneur"""
 
-Contract Type: {contract_type or 'General Business Contract'}
-
-CONTRACT TEXT:
-{contract_text}
-
-Provide your analysis in the following JSON format:
-{{
+_ANALYSIS_JSON_FORMAT = """{
     "overall_risk_score": <0-100>,
     "risk_level": "<low|medium|high|critical>",
     "issues": [
-        {{
+        {
             "severity": "<critical|high|medium|low>",
             "category": "<legal|financial|liability|termination|intellectual_property|confidentiality|other>",
             "issue": "<description>",
             "location": "<section/clause reference>",
             "recommendation": "<suggested action>"
-        }}
+        }
     ],
     "positive_aspects": ["<favorable term 1>", "<favorable term 2>"],
     "missing_clauses": ["<missing clause 1>", "<missing clause 2>"],
     "summary": "<executive summary of the contract analysis>"
-}}
+}"""
+
+_ANALYSIS_FOCUS = "Focus on protecting the entrepreneur from unfair terms, hidden risks, and ensuring they understand all obligations."
 
-Focus on protecting the entrepreneur from unfair terms, hidden risks, and ensuring they understand all obligations."""
+# Bump when the prompt or result schema changes to invalidate cached analyses.
+CONTRACT_CACHE_VERSION = 2
+CONTRACT_CACHE_TTL = 86400
+
+MAX_TOKENS_PER_CONTRACT = 2000
+
+_json_decoder = json.JSONDecoder()
+# In-process tier in front of Redis; holds GPT-4 results only, never fallbacks.
+_analysis_cache: LRUCache = LRUCache(maxsize=1024)
+
+def _single_prompt(contract_text: str, contract_type: Optional[str]) -> str:
+    return f"""You are a legal AI assistant specializing in contract analysis for small businesses and entrepreneurs. 
+Analyze the following contract and identify:
 
+{_ANALYSIS_INSTRUCTIONS}
+
+Contract Type: {contract_type or 'General Business Contract'}
+
+CONTRACT TEXT:
+{contract_text}
+
+Provide your analysis in the following JSON format:
+{_ANALYSIS_JSON_FORMAT}
+
+{_ANALYSIS_FOCUS}"""
+
+def _parse_json(result_text: str) -> dict:
+    """
+    Decode the JSON object in a completion. The common case is a bare or
+    ```json-fenced object; otherwise decode from the first '{' onwards.
+    """
+    text = result_text.strip().removeprefix("```json").removesuffix("```").strip()
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        start = text.find('{')
+        if start == -1:
+            raise
+        result, _ = _json_decoder.raw_decode(text, start)
+        return result
+
+def _build_result(result_json: dict) -> ContractAnalysisResult:
+    issues = [ContractIssue(**issue) for issue in result_json.get("issues", [])]
+    
+    return ContractAnalysisResult(
+        overall_risk_score=result_json.get("overall_risk_score", 50),
+        risk_level=result_json.get("risk_level", "medium"),
+        issues=issues,
+        positive_aspects=result_json.get("positive_aspects", []),
+        missing_clauses=result_json.get("missing_clauses", []),
+        summary=result_json.get("summary", "Contract analysis completed"),
+        analyzed_at=utcnow()
+    )
+
+async def _complete(prompt: str, max_tokens: int) -> str:
+    response = await get_openai_client().chat.completions.create(
+        model="gpt-4-turbo",
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content
+
+class ContractAnalyzerService:
+    async def analyze_contract(self, contract_text: str, contract_type: str = None) -> ContractAnalysisResult:
+        """
+        Analyze contract using GPT-4 to identify risks, unfair terms, and missing clauses.
+        """
+        analysis, _ = await self.analyze_contract_with_status(contract_text, contract_type)
+        return analysis
+    
+    async def analyze_contract_with_status(self, contract_text: str,
+                                           contract_type: str = None) -> Tuple[ContractAnalysisResult, bool]:
+        """
+        Analyze a contract and report whether the result is final: a GPT-4
+        analysis, or the rule-based one when no API key is configured. A
+        rule-based fallback after a GPT-4 failure is not final.
+        """
+        if not settings.OPENAI_API_KEY:
+            return await asyncio.to_thread(self._fallback_analysis, contract_text), True
+        
+        key = cache_key(f"contract:v{CONTRACT_CACHE_VERSION}", contract_type or "", contract_text)
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            return analysis, True
+        
+        cached = await cache_get(key)
+        if cached is not None:
+            analysis = ContractAnalysisResult.model_validate_json(cached)
+            _analysis_cache[key] = analysis
+            return analysis, True
+        
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert legal AI assistant specializing in contract analysis for entrepreneurs and small businesses."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            result_text = response.choices[0].message.content
-            
-            json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-            if json_match:
-                result_json = json.loads(json_match.group())
-            else:
-                result_json = json.loads(result_text)
-            
-            issues = [ContractIssue(**issue) for issue in result_json.get("issues", [])]
-            
-            return ContractAnalysisResult(
-                overall_risk_score=result_json.get("overall_risk_score", 50),
-                risk_level=result_json.get("risk_level", "medium"),
-                issues=issues,
-                positive_aspects=result_json.get("positive_aspects", []),
-                missing_clauses=result_json.get("missing_clauses", []),
-                summary=result_json.get("summary", "Contract analysis completed"),
-                analyzed_at=datetime.utcnow()
-            )
-            
+            analysis = await self._gpt4_analysis(contract_text, contract_type)
+            _analysis_cache[key] = analysis
+            await cache_set(key, analysis.model_dump_json().encode(), ttl=CONTRACT_CACHE_TTL)
+            return analysis, True
         except Exception as e:
-            print(f"GPT-4 API error: {e}")
-            raise
+            logger.warning("GPT-4 analysis failed: %s", e)
+            return await asyncio.to_thread(self._fallback_analysis, contract_text), False
+    
+    async def _gpt4_analysis(self, contract_text: str, contract_type: str = None) -> ContractAnalysisResult:
+        """Use GPT-4 to analyze one contract; every contract gets its own request."""
+        result_text = await _complete(_single_prompt(contract_text, contract_type), MAX_TOKENS_PER_CONTRACT)
+        return _build_result(_parse_json(result_text))
     
     def _fallback_analysis(self, contract_text: str) -> ContractAnalysisResult:
         """
@@ -104,24 +195,11 @@ Focus on protecting the entrepreneur from unfair terms, hidden risks, and ensuri
         issues = []
         risk_score = 30.0
         
-        red_flags = {
-            "non-compete": ("high", "legal", "Non-compete clause detected"),
-            "indemnif": ("high", "liability", "Indemnification clause requires review"),
-            "unlimited liability": ("critical", "liability", "Unlimited liability clause found"),
-            "automatic renewal": ("medium", "termination", "Automatic renewal clause detected"),
-            "no termination": ("high", "termination", "Difficult termination terms"),
-            "penalty": ("medium", "financial", "Penalty clauses present"),
-            "late fee": ("medium", "financial", "Late fee provisions found"),
-            "exclusive": ("medium", "legal", "Exclusivity clause detected"),
-            "confidential": ("low", "confidentiality", "Confidentiality obligations present"),
-            "intellectual property": ("medium", "intellectual_property", "IP assignment clause found"),
-        }
-        
-        contract_lower = contract_text.lower()
+        found = {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(contract_text.lower())}
         
-        for keyword, (severity, category, description) in red_flags.items():
-            if keyword in contract_lower:
-                issues.append(ContractIssue(
+        for keyword, (severity, category, description) in RED_FLAGS.items():
+            if keyword in found:
+                issues.append(ContractIssue.model_construct(
                     severity=severity,
                     category=category,
                     issue=description,
@@ -136,33 +214,14 @@ Focus on protecting the entrepreneur from unfair terms, hidden risks, and ensuri
                 elif severity == "medium":
                     risk_score += 10
         
-        missing_clauses = []
-        important_clauses = [
-            "dispute resolution", "termination", "liability", "payment terms",
-            "confidentiality", "intellectual property"
-        ]
-        
-        for clause in important_clauses:
-            if clause.lower() not in contract_lower:
-                missing_clauses.append(f"{clause.title()} clause")
-                risk_score += 5
+        missing_clauses = [label for clause, label in _MISSING_CLAUSE_LABELS.items() if clause not in found]
+        risk_score += 5 * len(missing_clauses)
         
         risk_score = min(risk_score, 100)
         
-        if risk_score >= 75:
-            risk_level = "critical"
-        elif risk_score >= 50:
-            risk_level = "high"
-        elif risk_score >= 25:
-            risk_level = "medium"
-        else:
-            risk_level = "low"
+        risk_level = get_risk_level(risk_score)
         
-        positive_aspects = []
-        if "mutual" in contract_lower:
-            positive_aspects.append("Contains mutual obligations")
-        if "reasonable" in contract_lower:
-            positive_aspects.append("Uses reasonable standards")
+        positive_aspects = [aspect for keyword, aspect in POSITIVE_TERMS.items() if keyword in found]
         
         summary = f"Contract analysis completed using rule-based system. Identified {len(issues)} potential issues. "
         summary += f"Overall risk level: {risk_level}. "
@@ -170,12 +229,12 @@ Focus on protecting the entrepreneur from unfair terms, hidden risks, and ensuri
             summary += f"Missing {len(missing_clauses)} important clauses. "
         summary += "Recommend full legal review before signing."
         
-        return ContractAnalysisResult(
+        return ContractAnalysisResult.model_construct(
             overall_risk_score=round(risk_score, 2),
             risk_level=risk_level,
             issues=issues,
             positive_aspects=positive_aspects,
             missing_clauses=missing_clauses,
             summary=summary,
-            analyzed_at=datetime.utcnow()
+            analyzed_at=utcnow()
         )
@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Optional
+import bisect
+
+# Risk score cut-offs; a score at or above a threshold moves up one level.
+_THRESHOLDS = (25, 50, 75)
+_LEVELS = ("low", "medium", "high", "critical")
+
+@lru_cache(maxsize=256)
+def calculate_operational_risk(employee_count: Optional[int], business_age_months: Optional[int]) -> float:
+    """Calculate operational risk score (0-100) from team size and business age."""
+    risk_score = 30.0
+    
+    if employee_count:
+        if employee_count < 3:
+            risk_score += 20
+        elif employee_count > 50:
+            risk_score -= 10
+    
+    if business_age_months:
+        if business_age_months < 6:
+            risk_score += 20
+        elif business_age_months > 24:
+            risk_score -= 10
+    
+    return max(min(risk_score, 100.0), 0.0)
+
+def get_risk_level(risk_score: float) -> str:
+    """Convert risk score to risk level."""
+    return _LEVELS[bisect.bisect_right(_THRESHOLDS, risk_score)]
@@ -1,28 +1,49 @@
 #!/usr/bin/env python3
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import orjson
 import uvicorn
+import logging
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
 from app.api.v1 import router as api_router
+from app.api.v1.contract_analyzer import shutdown_pdf_pool
+from app.api.v1.cyber_monitor import close_httpx_client, get_httpx_client
+from app.core.cache import close_redis_client, get_redis_client
 from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.core.openai_client import close_openai_client, get_openai_client
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("🚀 VentureGuard AI starting up...")
+    log_handler, log_listener = setup_logging(logging.DEBUG if settings.DEBUG else logging.INFO)
+    logger.info("🚀 VentureGuard AI starting up...")
+    # Clients are closed on shutdown, so every lifespan starts with fresh ones.
+    get_httpx_client()
+    get_redis_client()
+    get_openai_client()
     yield
-    print("👋 VentureGuard AI shutting down...")
+    shutdown_pdf_pool()
+    await close_httpx_client()
+    await close_redis_client()
+    await close_openai_client()
+    logger.info("👋 VentureGuard AI shutting down...")
+    logging.getLogger().removeHandler(log_handler)
+    log_listener.stop()
 
 app = FastAPI(
     title="VentureGuard AI API",
     description="AI-Powered Business Intelligence Guardian - Predict, Protect, Prosper",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -34,27 +55,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Probe endpoints are hit constantly and never change; serialize them once.
+_ROOT_BYTES = orjson.dumps({
+    "message": "VentureGuard AI API",
+    "version": "1.0.0",
+    "status": "running",
+    "docs": "/docs"
+})
+
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "environment": settings.APP_ENV
+})
+
 @app.get("/")
 async def root():
-    return {
-        "message": "VentureGuard AI API",
-        "version": "1.0.0",
-        "status": "running",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {
-        "status": "healthy",
-        "environment": settings.APP_ENV
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 app.include_router(api_router, prefix=f"/api/{settings.API_VERSION}")
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -66,9 +92,17 @@ async def http_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    # The reloader only supports a single process, so use it in development only.
+    reload = settings.DEBUG and settings.APP_ENV == "development"
+    workers = 1 if reload else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # Worker processes inherit this and size their PDF pools by it (see .env.example).
+    os.environ["WEB_CONCURRENCY"] = str(workers)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        workers=workers,
+        loop="auto",
+        http="httptools",
+        reload=reload
     )
@@ -0,0 +1,26 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.schemas.business_health import BusinessMetrics
+from app.services.business_health_service import BusinessHealthService, _slope
+
+@pytest.mark.parametrize("value", [0.3, 5000.0, 45000.0, -5000.0])
+def test_flat_series_has_zero_slope(value):
+    assert _slope(np.full(6, value)) == 0.0
+
+def test_slope_matches_polyfit():
+    rng = np.random.default_rng(0)
+    for n in range(3, 25):
+        y = rng.normal(0, 1000, n)
+        assert _slope(y) == pytest.approx(np.polyfit(range(n), y, 1)[0], abs=1e-9)
+
+def test_flat_series_is_not_reported_as_declining():
+    metrics = BusinessMetrics(monthly_revenue=[50000.0] * 6, monthly_expenses=[45000.0] * 6)
+    prediction = asyncio.run(BusinessHealthService().predict_business_health(metrics))
+    
+    assert prediction.predictions.cash_flow_trend == "improving"
+    assert prediction.predictions.revenue_trend == "growing"
+    assert prediction.predictions.projected_revenue_change == "0.0%"
+    assert not any("Declining cash flow" in r for r in prediction.recommendations)